@@ -3,21 +3,21 @@
 用于表示解析后的SQL语句结构
 """
 
-from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
 
 
-class ASTNode(ABC):
-    """AST节点基类"""
+class ASTNode:
+    """AST节点基类（子类必须实现accept）"""
+
+    __slots__ = ("line", "column")
 
     def __init__(self, line: int = 0, column: int = 0):
         self.line = line
         self.column = column
 
-    @abstractmethod
     def accept(self, visitor):
-        """访问者模式接口"""
-        pass
+        """访问者模式接口（保留以兼容旧代码，新代码请使用 ASTVisitor.walk）"""
+        raise NotImplementedError
 
     def __repr__(self):
         return f"{self.__class__.__name__}()"
@@ -26,18 +26,20 @@ class ASTNode(ABC):
 class Statement(ASTNode):
     """SQL语句基类"""
 
-    pass
+    __slots__ = ()
 
 
 class Expression(ASTNode):
     """表达式基类"""
 
-    pass
+    __slots__ = ()
 
 
 class DataType(ASTNode):
     """数据类型节点"""
 
+    __slots__ = ("type_name", "size")
+
     def __init__(
         self, type_name: str, size: Optional[int] = None, line: int = 0, column: int = 0
     ):
@@ -57,6 +59,8 @@ class DataType(ASTNode):
 class Identifier(Expression):
     """标识符节点"""
 
+    __slots__ = ("name",)
+
     def __init__(self, name: str, line: int = 0, column: int = 0):
         super().__init__(line, column)
         self.name = name
@@ -71,6 +75,8 @@ class Identifier(Expression):
 class Literal(Expression):
     """字面量节点"""
 
+    __slots__ = ("value", "data_type")
+
     def __init__(self, value: Any, data_type: str, line: int = 0, column: int = 0):
         super().__init__(line, column)
         self.value = value
@@ -86,6 +92,8 @@ class Literal(Expression):
 class ColumnDef(ASTNode):
     """列定义节点"""
 
+    __slots__ = ("name", "data_type")
+
     def __init__(self, name: str, data_type: DataType, line: int = 0, column: int = 0):
         super().__init__(line, column)
         self.name = name
@@ -101,6 +109,8 @@ class ColumnDef(ASTNode):
 class BinaryExpression(Expression):
     """二元表达式节点"""
 
+    __slots__ = ("left", "operator", "right")
+
     def __init__(
         self,
         left: Expression,
@@ -124,6 +134,8 @@ class BinaryExpression(Expression):
 class CreateTableStatement(Statement):
     """CREATE TABLE语句节点"""
 
+    __slots__ = ("table_name", "columns")
+
     def __init__(
         self, table_name: str, columns: List[ColumnDef], line: int = 0, column: int = 0
     ):
@@ -141,6 +153,8 @@ class CreateTableStatement(Statement):
 class InsertStatement(Statement):
     """INSERT语句节点"""
 
+    __slots__ = ("table_name", "columns", "values")
+
     def __init__(
         self,
         table_name: str,
@@ -164,6 +178,8 @@ class InsertStatement(Statement):
 class SelectStatement(Statement):
     """SELECT语句节点"""
 
+    __slots__ = ("select_list", "from_table", "where_clause")
+
     def __init__(
         self,
         select_list: List[Expression],
@@ -187,6 +203,8 @@ class SelectStatement(Statement):
 class DeleteStatement(Statement):
     """DELETE语句节点"""
 
+    __slots__ = ("table_name", "where_clause")
+
     def __init__(
         self,
         table_name: str,
@@ -208,6 +226,8 @@ class DeleteStatement(Statement):
 class UpdateStatement(Statement):
     """UPDATE语句节点"""
 
+    __slots__ = ("table_name", "assignments", "where_clause")
+
     def __init__(
         self,
         table_name: str,
@@ -231,6 +251,8 @@ class UpdateStatement(Statement):
 class SQLProgram(ASTNode):
     """SQL程序节点，包含多个语句"""
 
+    __slots__ = ("statements",)
+
     def __init__(self, statements: List[Statement], line: int = 0, column: int = 0):
         super().__init__(line, column)
         self.statements = statements
@@ -242,50 +264,72 @@ class SQLProgram(ASTNode):
         return f"SQLProgram({self.statements})"
 
 
+# 节点类型 -> 访问方法名，ASTVisitor据此按type(node)直接分派
+_VISIT_METHODS = {
+    DataType: "visit_data_type",
+    Identifier: "visit_identifier",
+    Literal: "visit_literal",
+    ColumnDef: "visit_column_def",
+    BinaryExpression: "visit_binary_expression",
+    CreateTableStatement: "visit_create_table_statement",
+    InsertStatement: "visit_insert_statement",
+    SelectStatement: "visit_select_statement",
+    DeleteStatement: "visit_delete_statement",
+    UpdateStatement: "visit_update_statement",
+    SQLProgram: "visit_sql_program",
+}
+
+
 # 访问者接口
-class ASTVisitor(ABC):
-    """AST访问者接口"""
+class ASTVisitor:
+    """AST访问者接口（子类需实现全部visit_*方法）"""
+
+    _dispatch: Dict[type, Any] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # 每个访问者子类预先解析好 节点类型 -> visit_* 函数 的分派表
+        cls._dispatch = {
+            node_type: getattr(cls, name) for node_type, name in _VISIT_METHODS.items()
+        }
+
+    def walk(self, node: ASTNode):
+        """访问节点：一次字典查找直接调用对应的visit_*方法"""
+        method = self._dispatch.get(type(node))
+        if method is None:
+            # 未登记的节点类型（如自定义子类）退回到accept双分派
+            return node.accept(self)
+        return method(self, node)
 
-    @abstractmethod
     def visit_data_type(self, node: DataType):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_identifier(self, node: Identifier):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_literal(self, node: Literal):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_column_def(self, node: ColumnDef):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_binary_expression(self, node: BinaryExpression):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_create_table_statement(self, node: CreateTableStatement):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_insert_statement(self, node: InsertStatement):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_select_statement(self, node: SelectStatement):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_delete_statement(self, node: DeleteStatement):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_update_statement(self, node: "UpdateStatement"):
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def visit_sql_program(self, node: SQLProgram):
-        pass
+        raise NotImplementedError
@@ -3,6 +3,7 @@
 负责维护数据库的元数据信息，包括表结构、列信息等
 """
 
+import sys
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
@@ -16,6 +17,11 @@ class ColumnInfo:
     size: Optional[int] = None
     is_nullable: bool = True
 
+    def __post_init__(self):
+        # 大写并驻留的列名，构造时计算一次，避免查找时反复调用 upper()；
+        # 作为普通属性而非字段，不出现在 fields()/asdict() 中
+        self.name_upper: str = sys.intern(self.name.upper())
+
     def __repr__(self):
         if self.size:
             return f"{self.name} {self.data_type}({self.size})"
@@ -29,12 +35,25 @@ class TableInfo:
     name: str
     columns: List[ColumnInfo]
 
+    def __post_init__(self):
+        # 按大写列名建立索引；columns 目前只在构造时赋值，
+        # 若以后引入修改列的路径，需要调用 _rebuild_index 重建
+        self._rebuild_index()
+
+    def _rebuild_index(self):
+        """重建大写列名索引"""
+        self._by_upper: Dict[str, ColumnInfo] = {}
+        for col in self.columns:
+            # 同名列保留第一个，与原先的线性查找保持一致
+            self._by_upper.setdefault(col.name_upper, col)
+
     def get_column(self, column_name: str) -> Optional[ColumnInfo]:
         """根据列名获取列信息"""
-        for col in self.columns:
-            if col.name.upper() == column_name.upper():
-                return col
-        return None
+        return self._by_upper.get(column_name.upper())
+
+    def has_column(self, column_name: str) -> bool:
+        """检查列是否存在"""
+        return column_name.upper() in self._by_upper
 
     def get_column_names(self) -> List[str]:
         """获取所有列名"""
@@ -50,9 +69,14 @@ class Catalog:
     def __init__(self):
         self._tables: Dict[str, TableInfo] = {}
 
+    @staticmethod
+    def _norm(name: str) -> str:
+        """规范化名称：转大写并驻留，便于字典快速比较"""
+        return sys.intern(name.upper())
+
     def create_table(self, table_name: str, columns: List[ColumnInfo]) -> bool:
         """创建表"""
-        table_key = table_name.upper()
+        table_key = self._norm(table_name)
 
         if table_key in self._tables:
             return False  # 表已存在
@@ -62,7 +86,7 @@ class Catalog:
 
     def drop_table(self, table_name: str) -> bool:
         """删除表"""
-        table_key = table_name.upper()
+        table_key = self._norm(table_name)
 
         if table_key not in self._tables:
             return False  # 表不存在
@@ -72,7 +96,7 @@ class Catalog:
 
     def table_exists(self, table_name: str) -> bool:
         """检查表是否存在"""
-        return table_name.upper() in self._tables
+        return self._norm(table_name) in self._tables
 
     def column_exists(self, table_name: str, column_name: str) -> bool:
         """检查列是否存在"""
@@ -83,7 +107,7 @@ class Catalog:
 
     def get_table_info(self, table_name: str) -> Optional[TableInfo]:
         """获取表信息"""
-        return self._tables.get(table_name.upper())
+        return self._tables.get(self._norm(table_name))
 
     def get_column_info(
         self, table_name: str, column_name: str
@@ -106,14 +130,13 @@ class Catalog:
         if not table_info:
             return False, f"Table '{table_name}' does not exist"
 
-        table_columns = [col.name.upper() for col in table_info.columns]
-
-        for col_name in column_names:
-            if col_name.upper() not in table_columns:
-                return (
-                    False,
-                    f"Column '{col_name}' does not exist in table '{table_name}'",
-                )
+        has_column = table_info.has_column
+        missing = [name for name in column_names if not has_column(name)]
+        if missing:
+            return (
+                False,
+                f"Column '{missing[0]}' does not exist in table '{table_name}'",
+            )
 
         return True, ""
 
@@ -159,7 +182,9 @@ class Catalog:
                 )
                 columns.append(column)
 
-            self._tables[table_name] = TableInfo(table_data["name"], columns)
+            self._tables[self._norm(table_name)] = TableInfo(
+                table_data["name"], columns
+            )
 
     def __repr__(self):
         return f"Catalog({list(self._tables.keys())})"
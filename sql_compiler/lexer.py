@@ -1,46 +1,52 @@
-"""SQL词法分析器 - 负责将SQL语句分解为Token序列"""
+"""SQL词法分析器 - 负责将SQL语句分解为Token序列
 
-from dataclasses import dataclass
-from enum import Enum, auto
-from typing import List, Optional
+本模块保持可被 mypyc 编译（所有属性均有类型标注），可选地就地编译为C扩展：
+    pip install mypy && mypyc --follow-imports=silent sql_compiler/lexer.py
+生成的 .so 会优先于本文件被导入；删除 .so 即回退到纯Python实现。
+"""
 
+import re
+import sys
+from bisect import bisect_left
+from enum import IntEnum
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
 
-class TokenType(Enum):
-    """Token类型枚举"""
+
+class TokenType(IntEnum):
+    """Token类型枚举（整数值，比较即为原生整数比较）"""
 
     # 关键字
-    KEYWORD = auto()
+    KEYWORD = 0
 
     # 标识符和常量
-    IDENTIFIER = auto()
-    INTEGER = auto()
-    STRING = auto()
+    IDENTIFIER = 1
+    INTEGER = 2
+    STRING = 3
 
     # 运算符
-    EQUALS = auto()
-    NOT_EQUALS = auto()
-    LESS_THAN = auto()
-    GREATER_THAN = auto()
-    LESS_EQUALS = auto()
-    GREATER_EQUALS = auto()
+    EQUALS = 4
+    NOT_EQUALS = 5
+    LESS_THAN = 6
+    GREATER_THAN = 7
+    LESS_EQUALS = 8
+    GREATER_EQUALS = 9
 
     # 分隔符
-    COMMA = auto()
-    SEMICOLON = auto()
-    LEFT_PAREN = auto()
-    RIGHT_PAREN = auto()
+    COMMA = 10
+    SEMICOLON = 11
+    LEFT_PAREN = 12
+    RIGHT_PAREN = 13
 
     # 特殊
-    EOF = auto()
-    ERROR = auto()
+    EOF = 14
+    ERROR = 15
 
 
-@dataclass
-class Token:
-    """Token数据结构"""
+class Token(NamedTuple):
+    """Token数据结构（不可变元组，无实例__dict__）"""
 
     type: TokenType
-    value: str
+    value: Union[str, int]  # INTEGER类型的Token在词法分析时即转换为int
     line: int
     column: int
 
@@ -58,11 +64,88 @@ class LexerError(Exception):
         super().__init__(f"Lexical error at line {line}, column {column}: {message}")
 
 
-class SQLLexer:
-    """SQL词法分析器"""
+try:  # 可选依赖：google-re2，提供基于DFA的线性时间匹配
+    import re2
+except ImportError:
+    re2 = None
+
+# 词法规则：(分组名, 标准库re写法, re2写法)，按优先级排列
+# re2的\s、\d、\w只匹配ASCII，因此需要显式写出Unicode字符类；
+# 两种写法接受的字符集一致：IDENT首字符在re下另由isalpha()检查，与re2的\pL相同
+_TOKEN_SPEC = [
+    ("WS", r"\s+", r"[\s\v\x1c-\x1f\x85\pZ]+"),
+    ("COMMENT", r"--[^\n]*|/\*.*?\*/", None),
+    ("STRING", r"'(?:\\.|[^'\\])*'" r'|"(?:\\.|[^"\\])*"', None),
+    ("NUMBER", r"\d+", r"\p{Nd}+"),
+    ("IDENT", r"[^\W\d]\w*", r"[\pL_][\pL\pN_]*"),
+    ("OP", r"<=|>=|<>|!=|[=<>]", None),
+    ("DELIM", r"[,;()*]", None),
+]
+
+
+def _compile_scanner(backend: str):
+    """按指定后端编译主扫描正则"""
+    if backend == "re2":
+        if re2 is None:
+            raise ImportError("google-re2 is required for the re2 scanner backend")
+        return re2.compile(
+            "(?s)"
+            + "|".join(
+                f"(?P<{name}>{re2_regex or regex})"
+                for name, regex, re2_regex in _TOKEN_SPEC
+            )
+        )
+    if backend == "re":
+        return re.compile(
+            "(?s)" + "|".join(f"(?P<{name}>{regex})" for name, regex, _ in _TOKEN_SPEC)
+        )
+    raise ValueError(f"Unknown scanner backend '{backend}'")
 
-    # SQL关键字
-    KEYWORDS = {
+
+# 主扫描正则：每次匹配产生一个词素
+# 默认使用标准库re：re2的Python绑定逐个构造Match对象，在短Token为主的SQL上
+# 反而更慢，只在需要线性时间保证时再通过 SQLLexer(source, backend="re2") 选用
+SCANNER_BACKEND = "re"
+
+# 已编译的主扫描正则，按后端名缓存，各词法分析器实例共用
+_SCANNERS: Dict[str, Any] = {}
+
+
+def _get_scanner(backend: str):
+    """返回指定后端的主扫描正则，首次使用时编译"""
+    scanner = _SCANNERS.get(backend)
+    if scanner is None:
+        scanner = _SCANNERS[backend] = _compile_scanner(backend)
+    return scanner
+
+
+_get_scanner(SCANNER_BACKEND)
+
+
+# 字符串字面量中的转义序列
+_ESCAPE_RE = re.compile(r"\\(.)", re.DOTALL)
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r"}
+
+
+def _unescape(body: str) -> str:
+    """解码字符串字面量中的转义字符"""
+    if "\\" not in body:
+        return body
+    return _ESCAPE_RE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(1)), body)
+
+
+# 字符类别扫描：sre把字符类编译成位图查找表，整段连续字符在C中一次扫过
+# \s、\w与str.isspace()、isalnum()/"_"的判定完全一致；
+# \d只覆盖十进制数字，因此数字用ASCII位图再对非ASCII的isdigit()补扫
+_SPACE_RUN = re.compile(r"\s*").match
+_IDENT_RUN = re.compile(r"\w*").match
+_DIGIT_RUN = re.compile(r"[0-9]*").match
+
+
+# SQL关键字：驻留字符串的frozenset，成员判断走指针比较的快速路径
+KEYWORDS = frozenset(
+    sys.intern(keyword)
+    for keyword in (
         "CREATE",
         "TABLE",
         "INSERT",
@@ -81,7 +164,15 @@ class SQLLexer:
         "AND",
         "OR",
         "NOT",
-    }
+    )
+)
+
+
+class SQLLexer:
+    """SQL词法分析器"""
+
+    # SQL关键字
+    KEYWORDS = KEYWORDS
 
     # 运算符映射
     OPERATORS = {
@@ -103,228 +194,235 @@ class SQLLexer:
         "*": TokenType.IDENTIFIER,  # 临时将 * 作为标识符处理
     }
 
-    def __init__(self, source: str):
-        self.source = source
-        self.position = 0
-        self.line = 1
-        self.column = 1
+    def __init__(
+        self, source: str, positions: bool = True, backend: str = SCANNER_BACKEND
+    ):
+        self.source: str = source
+        self.position: int = 0
         self.tokens: List[Token] = []
+        # positions=False 时不记录位置，相同类型和值的Token共用同一个对象；
+        # 所有Token（包括EOF）的行号列号均为0，由此构建的AST和报错信息也不带位置
+        self.positions: bool = positions
+        self._token_pool: Dict[Tuple[TokenType, Union[str, int]], Token] = {}
+        # 主扫描正则的后端（"re" 或 "re2"），只影响本实例
+        self.backend: str = backend
+        self._token_re: Any = _get_scanner(backend)
+        # 换行符偏移表：字符级移动只维护position，行号列号按需推算
+        self._newlines: List[int] = [m.start() for m in re.finditer("\n", source)]
+
+    @property
+    def line(self) -> int:
+        """当前位置的行号"""
+        return self._line_col(self.position)[0]
+
+    @property
+    def column(self) -> int:
+        """当前位置的列号"""
+        return self._line_col(self.position)[1]
 
     def current_char(self) -> Optional[str]:
         """获取当前字符"""
-        if self.position >= len(self.source):
-            return None
-        return self.source[self.position]
+        pos = self.position
+        src = self.source
+        return src[pos] if pos < len(src) else None
 
     def peek_char(self, offset: int = 1) -> Optional[str]:
         """预览后续字符"""
         pos = self.position + offset
-        if pos >= len(self.source):
-            return None
-        return self.source[pos]
+        src = self.source
+        return src[pos] if pos < len(src) else None
 
     def advance(self) -> Optional[str]:
         """移动到下一个字符"""
-        if self.position >= len(self.source):
+        pos = self.position
+        src = self.source
+        if pos >= len(src):
             return None
 
-        char = self.source[self.position]
-        self.position += 1
-
-        if char == "\n":
-            self.line += 1
-            self.column = 1
-        else:
-            self.column += 1
-
-        return char
+        self.position = pos + 1
+        return src[pos]
 
     def skip_whitespace(self):
         """跳过空白字符"""
-        while self.current_char() and self.current_char().isspace():
-            self.advance()
+        run = _SPACE_RUN(self.source, self.position)
+        if run:
+            self.position = run.end()
 
     def read_string(self) -> str:
         """读取字符串字面量"""
-        quote_char = self.current_char()  # ' 或 "
-        start_line, start_column = self.line, self.column
-        self.advance()  # 跳过开始引号
-
-        value = ""
-        while self.current_char() and self.current_char() != quote_char:
-            char = self.advance()
-            if char == "\\":  # 处理转义字符
-                next_char = self.advance()
-                if next_char == "n":
-                    value += "\n"
-                elif next_char == "t":
-                    value += "\t"
-                elif next_char == "r":
-                    value += "\r"
-                elif next_char == "\\":
-                    value += "\\"
-                elif next_char == quote_char:
-                    value += quote_char
-                else:
-                    value += next_char or ""
-            else:
-                value += char
+        quote_char = self.source[self.position]  # ' 或 "
+        start_line, start_column = self._line_col(self.position)
+        src = self.source
+        length = len(src)
+
+        # 按片段切片拼接，没有转义字符时只需一次find和一次切片
+        parts = []
+        pos = self.position + 1  # 跳过开始引号
+        while True:
+            end = src.find(quote_char, pos)
+            backslash = src.find("\\", pos, length if end == -1 else end)
+            if backslash == -1:
+                if end == -1:
+                    self.position = length
+                    raise LexerError(
+                        "Unterminated string literal", start_line, start_column
+                    )
+                parts.append(src[pos:end])
+                break
 
-        if not self.current_char():
-            raise LexerError("Unterminated string literal", start_line, start_column)
+            # 处理转义字符
+            parts.append(src[pos:backslash])
+            escaped = src[backslash + 1 : backslash + 2]
+            parts.append(_ESCAPES.get(escaped, escaped))
+            pos = backslash + 2
 
-        self.advance()  # 跳过结束引号
-        return value
+        self.position = end + 1  # 跳过结束引号
+        return parts[0] if len(parts) == 1 else "".join(parts)
 
     def read_number(self) -> str:
         """读取数字"""
-        value = ""
-        while self.current_char() and self.current_char().isdigit():
-            value += self.advance()
-        return value
+        src = self.source
+        length = len(src)
+        start = end = self.position
+        while True:
+            # 以*结尾的模式总能匹配（可能为空），判空仅为满足类型检查
+            run = _DIGIT_RUN(src, end)
+            end = run.end() if run else end
+            if end < length and src[end].isdigit():
+                end += 1
+            else:
+                break
+        self.position = end
+        return src[start:end]
 
     def read_identifier(self) -> str:
         """读取标识符"""
-        value = ""
-        while self.current_char() and (
-            self.current_char().isalnum() or self.current_char() == "_"
-        ):
-            value += self.advance()
-        return value
-
-    def read_operator(self) -> str:
+        src = self.source
+        start = self.position
+        run = _IDENT_RUN(src, start)
+        end = run.end() if run else start
+        self.position = end
+        return src[start:end]
+
+    def read_operator(self) -> Optional[str]:
         """读取运算符"""
-        char = self.current_char()
+        src = self.source
+        pos = self.position
 
         # 检查双字符运算符
-        if char in ["!", "<", ">"]:
-            next_char = self.peek_char()
-            if next_char == "=":
-                self.advance()  # 第一个字符
-                self.advance()  # 第二个字符
-                return char + "="
-            elif char == "<" and next_char == ">":
-                self.advance()
-                self.advance()
-                return "<>"
+        operator = src[pos : pos + 2]
+        if len(operator) == 2 and operator in self.OPERATORS:
+            self.position = pos + 2
+            return operator
 
         # 单字符运算符
         return self.advance()
 
+    def _line_col(self, pos: int) -> Tuple[int, int]:
+        """根据换行符偏移表计算位置对应的行号和列号"""
+        newlines = self._newlines
+        line = bisect_left(newlines, pos)
+        if line == 0:
+            return 1, pos + 1
+        return line + 1, pos - newlines[line - 1]
+
+    def _scan_error(self, pos: int) -> LexerError:
+        """为无法匹配的位置构造词法错误"""
+        src = self.source
+        char = src[pos]
+        line, column = self._line_col(pos)
+
+        if char in "\"'":
+            return LexerError("Unterminated string literal", line, column)
+        if src.startswith("/*", pos):
+            return LexerError("Unterminated comment", line, column)
+        if char == "!":
+            return LexerError(f"Unknown operator '{char}'", line, column)
+        return LexerError(f"Unexpected character '{char}'", line, column)
+
+    def _pooled_token(
+        self, token_type: TokenType, value: Union[str, int], line: int, column: int
+    ) -> Token:
+        """返回共享的无位置Token（行号列号均为0）"""
+        key = (token_type, value)
+        token = self._token_pool.get(key)
+        if token is None:
+            token = self._token_pool[key] = Token(token_type, value, 0, 0)
+        return token
+
     def tokenize(self) -> List[Token]:
         """执行词法分析，返回Token列表"""
-        self.tokens = []
+        tokens: List[Token] = []
+        self.tokens = tokens
+        # 出错时LexerError直接向上传播，已识别的Token仍保留在self.tokens中；
+        # 逐个append而非extend：mypyc编译后extend在生成器抛出异常时不保留已产生的元素
+        for token in self.iter_tokens():
+            tokens.append(token)
+        return tokens
+
+    def iter_tokens(self) -> Iterator[Token]:
+        """惰性地逐个产生Token，最后产生EOF；遇到无法识别的输入时抛出LexerError
+
+        与tokenize()不同，不在self.tokens中保留Token列表，适合边扫描边解析。
+        """
+        src = self.source
+        length = len(src)
+
+        pos = self.position
+        intern = sys.intern
+        keywords = self.KEYWORDS
+        delimiters = self.DELIMITERS
+        operators = self.OPERATORS
+        new_token = Token if self.positions else self._pooled_token
+        # 行号随换行递增维护，列号由当前行起始偏移推算
+        line, column = self._line_col(pos)
+        line_start = pos - column + 1
+
+        # 一次finditer遍历整个输入；匹配之间出现空隙说明该位置无法识别
+        for m in self._token_re.finditer(src, pos):
+            if m.start() != pos:
+                break
 
-        try:
-            while self.position < len(self.source):
-                self.skip_whitespace()
+            kind = m.lastgroup
+            value = m.group()
+            column = pos - line_start + 1
 
-                if not self.current_char():
+            if kind == "IDENT":
+                # \w还包含'²'、'½'等非字母的数字字符，标识符首字符须为字母或下划线
+                first = value[0]
+                if not first.isalpha() and first != "_":
                     break
-
-                char = self.current_char()
-                current_line, current_column = self.line, self.column
-
-                # 字符串字面量
-                if char in ['"', "'"]:
-                    try:
-                        value = self.read_string()
-                        token = Token(
-                            TokenType.STRING, value, current_line, current_column
-                        )
-                        self.tokens.append(token)
-                    except LexerError as lex_error:
-                        error_token = Token(
-                            TokenType.ERROR,
-                            lex_error.message,
-                            current_line,
-                            current_column,
-                        )
-                        self.tokens.append(error_token)
-                        raise
-
-                # 数字
-                elif char.isdigit():
-                    value = self.read_number()
-                    token = Token(
-                        TokenType.INTEGER, value, current_line, current_column
-                    )
-                    self.tokens.append(token)
-
-                # 标识符或关键字
-                elif char.isalpha() or char == "_":
-                    value = self.read_identifier()
-                    token_type = (
-                        TokenType.KEYWORD
-                        if value.upper() in self.KEYWORDS
-                        else TokenType.IDENTIFIER
-                    )
-                    token = Token(
-                        token_type, value.upper(), current_line, current_column
-                    )
-                    self.tokens.append(token)
-
-                # 运算符
-                elif char in "=!<>":
-                    operator = self.read_operator()
-                    if operator in self.OPERATORS:
-                        token_type = self.OPERATORS[operator]
-                        token = Token(
-                            token_type, operator, current_line, current_column
-                        )
-                        self.tokens.append(token)
-                    else:
-                        raise LexerError(
-                            f"Unknown operator '{operator}'",
-                            current_line,
-                            current_column,
-                        )
-
-                # 分隔符
-                elif char in self.DELIMITERS:
-                    token_type = self.DELIMITERS[char]
-                    token = Token(token_type, char, current_line, current_column)
-                    self.tokens.append(token)
-                    self.advance()
-
-                # 单行注释
-                elif char == "-" and self.peek_char() == "-":
-                    # 跳过注释直到行末
-                    while self.current_char() and self.current_char() != "\n":
-                        self.advance()
-
-                # 多行注释
-                elif char == "/" and self.peek_char() == "*":
-                    self.advance()  # 跳过 /
-                    self.advance()  # 跳过 *
-                    # 查找注释结束
-                    while self.current_char():
-                        if self.current_char() == "*" and self.peek_char() == "/":
-                            self.advance()  # 跳过 *
-                            self.advance()  # 跳过 /
-                            break
-                        self.advance()
-                    else:
-                        raise LexerError(
-                            "Unterminated comment", current_line, current_column
-                        )
-
-                # 未识别字符
-                else:
-                    raise LexerError(
-                        f"Unexpected character '{char}'", current_line, current_column
-                    )
-
-            # 添加EOF标记
-            self.tokens.append(Token(TokenType.EOF, "", self.line, self.column))
-
-        except LexerError as e:
-            # 添加错误Token
-            error_token = Token(TokenType.ERROR, e.message, e.line, e.column)
-            self.tokens.append(error_token)
-            raise
-
-        return self.tokens
+                # 驻留后存入Token，语法分析中的关键字比较可走指针比较
+                upper_value = intern(value.upper())
+                token_type = (
+                    TokenType.KEYWORD
+                    if upper_value in keywords
+                    else TokenType.IDENTIFIER
+                )
+                yield new_token(token_type, upper_value, line, column)
+            elif kind == "DELIM":
+                yield new_token(delimiters[value], value, line, column)
+            elif kind == "NUMBER":
+                yield new_token(TokenType.INTEGER, int(value), line, column)
+            elif kind == "OP":
+                # 运算符同样驻留，值比较可直接走指针比较
+                yield new_token(operators[value], intern(value), line, column)
+            elif kind == "STRING":
+                yield new_token(TokenType.STRING, _unescape(value[1:-1]), line, column)
+
+            # 空白、注释和字符串可能跨行
+            if kind != "IDENT" and "\n" in value:
+                line += value.count("\n")
+                line_start = pos + value.rindex("\n") + 1
+
+            pos = m.end()
+
+        self.position = pos
+        if pos < length:
+            raise self._scan_error(pos)
+
+        # 添加EOF标记
+        yield new_token(TokenType.EOF, "", line, pos - line_start + 1)
 
     def get_tokens(self) -> List[Token]:
         """获取Token列表"""
@@ -335,20 +433,28 @@ class SQLLexer:
     def print_tokens(self):
         """打印Token序列，用于调试"""
         tokens = self.get_tokens()
-        print("Token序列:")
-        print("=" * 50)
-        print(f"{'类型':<12} {'值':<15} {'位置':<10}")
-        print("-" * 50)
+        lines = [
+            "Token序列:",
+            "=" * 50,
+            f"{'类型':<12} {'值':<15} {'位置':<10}",
+            "-" * 50,
+        ]
 
         for token in tokens:
             if token.type == TokenType.EOF:
                 break
-            print(
+            lines.append(
                 f"{token.type.name:<12} {token.value:<15} {token.line}:{token.column}"
             )
 
-        print("-" * 50)
-        print(f"共生成 {len([t for t in tokens if t.type != TokenType.EOF])} 个Token")
+        # Token序列仅以一个EOF结尾，计数无需再遍历一遍
+        count = len(tokens)
+        if tokens and tokens[-1].type == TokenType.EOF:
+            count -= 1
+        lines.append("-" * 50)
+        lines.append(f"共生成 {count} 个Token")
+        # 整体一次写出，避免逐行print
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
@@ -1,8 +1,14 @@
-"""简化版SQL词法分析器 - 修复代码质量问题"""
+"""简化版SQL词法分析器 - 修复代码质量问题
 
+与 lexer.py 相同，本模块保持可被 mypyc 编译，可选地就地编译为C扩展：
+    pip install mypy && mypyc --follow-imports=silent sql_compiler/lexer_clean.py
+生成的 .so 会优先于本文件被导入；删除 .so 即回退到纯Python实现。
+"""
+
+import re
+import sys
 from enum import Enum, auto
-from typing import List, Optional
-from dataclasses import dataclass
+from typing import Dict, List, NamedTuple, Tuple
 
 
 class TokenType(Enum):
@@ -25,9 +31,8 @@ class TokenType(Enum):
     ERROR = auto()
 
 
-@dataclass
-class Token:
-    """Token数据结构"""
+class Token(NamedTuple):
+    """Token数据结构（不可变元组，无实例__dict__）"""
     type: TokenType
     value: str
     line: int
@@ -45,243 +50,230 @@ class LexerError(Exception):
         super().__init__(f"Lexical error at {location}: {message}")
 
 
+# 主扫描正则：每次匹配一个词素，由C实现的正则引擎完成逐字符扫描
+_SCANNER = re.compile(
+    r"(?P<WS>\s+)"
+    r"|(?P<COMMENT>--[^\n]*)"
+    r"|(?P<STRING>['\"])"
+    r"|(?P<NUMBER>\d+)"
+    r"|(?P<IDENT>[^\W\d]\w*)"
+    r"|(?P<PUNCT>!=|<>|<=|>=|[=<>,;()])",
+    re.DOTALL,
+)
+
+# 转义序列表：反斜杠后的字符 -> 实际字符，表外字符按原样保留
+_ESCAPES = {'n': '\n', 't': '\t', '\\': '\\', "'": "'", '"': '"'}
+
+
+def _scan_string(src: str, start: int) -> Tuple[str, int]:
+    """从start处的引号起单遍扫描字符串字面量
+    
+    返回解码转义后的内容和闭合引号之后的位置；未闭合时位置为-1。
+    """
+    quote_char = src[start]
+    # 在闭合引号之前逐段查找反斜杠，原样片段与转义结果依次收集
+    parts: List[str] = []
+    i = start + 1
+    end = src.find(quote_char, i)
+    while end != -1:
+        backslash = src.find('\\', i, end)
+        if backslash == -1:
+            parts.append(src[i:end])
+            break
+        parts.append(src[i:backslash])
+        char = src[backslash + 1]
+        parts.append(_ESCAPES.get(char, char))
+        i = backslash + 2
+        if end < i:
+            # 被转义的正是这个引号，继续向后找闭合引号
+            end = src.find(quote_char, i)
+    
+    if end == -1:
+        return '', -1
+    return ''.join(parts), end + 1
+
+
+def _digit_end(src: str, pos: int) -> int:
+    """返回从pos起连续数字字符的结束位置
+    
+    按str.isdigit()判断，'²'等上标数字也计入，与原先逐字符读取数字的行为一致。
+    """
+    length = len(src)
+    while pos < length and src[pos].isdigit():
+        pos += 1
+    return pos
+
+
+KEYWORDS = frozenset(map(sys.intern, [
+    'CREATE', 'TABLE', 'INSERT', 'INTO', 'SELECT', 'FROM', 'WHERE',
+    'VALUES', 'DELETE', 'INT', 'INTEGER', 'VARCHAR', 'CHAR'
+]))
+
+# 关键字拼写表：原始拼写 -> (Token类型, 大写值)，只读
+# 预置关键字的常见大小写形式，各实例以其副本作为标识符查找表的初始内容
+_IDENT_TABLE: Dict[str, Tuple[TokenType, str]] = {
+    spelling: (TokenType.KEYWORD, keyword)
+    for keyword in KEYWORDS
+    for spelling in (keyword, keyword.lower(), keyword.capitalize())
+}
+
+OPERATORS = {
+    '=': TokenType.EQUALS,
+    '!=': TokenType.NOT_EQUALS,
+    '<>': TokenType.NOT_EQUALS,
+    '<': TokenType.LESS_THAN,
+    '>': TokenType.GREATER_THAN,
+    '<=': TokenType.LESS_EQUALS,
+    '>=': TokenType.GREATER_EQUALS,
+}
+
+DELIMITERS = {
+    ',': TokenType.COMMA,
+    ';': TokenType.SEMICOLON,
+    '(': TokenType.LEFT_PAREN,
+    ')': TokenType.RIGHT_PAREN,
+}
+
+# 运算符与分隔符合并为一张表，一次查表即得Token类型
+PUNCTUATION = {**OPERATORS, **DELIMITERS}
+
+
 class SQLLexer:
     """SQL词法分析器"""
     
-    KEYWORDS = {
-        'CREATE', 'TABLE', 'INSERT', 'INTO', 'SELECT', 'FROM', 'WHERE',
-        'VALUES', 'DELETE', 'INT', 'INTEGER', 'VARCHAR', 'CHAR'
-    }
+    KEYWORDS = KEYWORDS
+    OPERATORS = OPERATORS
+    DELIMITERS = DELIMITERS
+    PUNCTUATION = PUNCTUATION
     
     def __init__(self, source: str):
-        self.source = source
-        self.position = 0
-        self.line = 1
-        self.column = 1
+        self.source: str = source
+        self.position: int = 0
+        self.line: int = 1
+        self.column: int = 1
         self.tokens: List[Token] = []
-    
-    def current_char(self) -> Optional[str]:
-        """获取当前字符"""
-        if self.position >= len(self.source):
-            return None
-        return self.source[self.position]
-    
-    def advance(self) -> Optional[str]:
-        """移动到下一个字符"""
-        if self.position >= len(self.source):
-            return None
-        
-        char = self.source[self.position]
-        self.position += 1
-        
-        if char == '\n':
-            self.line += 1
-            self.column = 1
-        else:
-            self.column += 1
-        
-        return char
-    
-    def skip_whitespace(self):
-        """跳过空白字符"""
-        while self.current_char() and self.current_char().isspace():
-            self.advance()
-    
-    def read_string(self) -> str:
-        """读取字符串字面量"""
-        quote_char = self.current_char()
-        start_line, start_column = self.line, self.column
-        self.advance()
-        
-        value = ""
-        while self.current_char() and self.current_char() != quote_char:
-            char = self.advance()
-            if char == '\\':
-                next_char = self.advance()
-                if next_char == 'n':
-                    value += '\n'
-                elif next_char == 't':
-                    value += '\t'
-                elif next_char == '\\':
-                    value += '\\'
-                elif next_char == quote_char:
-                    value += quote_char
-                else:
-                    value += next_char or ""
-            else:
-                value += char
-        
-        if not self.current_char():
-            raise LexerError("Unterminated string literal", 
-                           start_line, start_column)
-        
-        self.advance()
-        return value
-    
-    def read_number(self) -> str:
-        """读取数字"""
-        value = ""
-        while self.current_char() and self.current_char().isdigit():
-            value += self.advance()
-        return value
-    
-    def read_identifier(self) -> str:
-        """读取标识符"""
-        value = ""
-        while (self.current_char() and 
-               (self.current_char().isalnum() or self.current_char() == '_')):
-            value += self.advance()
-        return value
+        # 标识符查找表：命中时无需upper()和集合查找；未命中的拼写只记入本实例，
+        # 随词法分析器一起释放
+        self._ident_table: Dict[str, Tuple[TokenType, str]] = dict(_IDENT_TABLE)
     
     def tokenize(self) -> List[Token]:
         """执行词法分析"""
         self.tokens = []
-        
-        while self.position < len(self.source):
-            self._process_next_token()
-        
-        self.tokens.append(Token(TokenType.EOF, '', self.line, self.column))
-        return self.tokens
-    
-    def _process_next_token(self):
-        """处理下一个Token"""
-        self.skip_whitespace()
-        
-        if not self.current_char():
-            return
-        
-        char = self.current_char()
-        current_line, current_column = self.line, self.column
-        
-        try:
-            if char in ['"', "'"]:
-                self._process_string_token(current_line, current_column)
-            elif char.isdigit():
-                self._process_number_token(current_line, current_column)
-            elif char.isalpha() or char == '_':
-                self._process_identifier_token(current_line, current_column)
-            elif char in '=!<>':
-                self._process_operator_token(current_line, current_column)
-            elif char in ',;()':
-                self._process_delimiter_token(current_line, current_column)
-            elif char == '-' and self._peek() == '-':
-                self._skip_line_comment()
+        tokens = self.tokens
+        src = self.source
+        length = len(src)
+        pos = self.position
+        line, column = self.line, self.column
+        line_start = pos - column + 1
+        ident_get = self._ident_table.get
+        punctuation = self.PUNCTUATION
+
+        match = _SCANNER.match
+        while True:
+            m = match(src, pos)
+            if m is None:
+                break
+
+            kind = m.lastgroup
+            end = m.end()
+            column = pos - line_start + 1
+
+            if kind == 'IDENT':
+                value = m.group()
+                entry = ident_get(value)
+                if entry is None:
+                    # \w还包含'²'、'½'等非字母的数字字符，首字符须为字母或下划线；
+                    # 查找表中只会记入已通过检查的拼写
+                    first = value[0]
+                    if first.isdigit():
+                        # '²'等isdigit()字符与原先一样作为整数读取
+                        end = _digit_end(src, pos)
+                        tokens.append(
+                            Token(TokenType.INTEGER, src[pos:end], line, column))
+                        pos = end
+                        continue
+                    if not first.isalpha() and first != '_':
+                        break
+                    entry = self._classify_identifier(value)
+                tokens.append(Token(entry[0], entry[1], line, column))
+            elif kind == 'PUNCT':
+                value = m.group()
+                tokens.append(Token(punctuation[value], value, line, column))
+            elif kind == 'NUMBER':
+                if end < length and src[end].isdigit():
+                    # \d只匹配十进制数字，后接'²'等数字字符时继续读取
+                    end = _digit_end(src, end)
+                tokens.append(Token(TokenType.INTEGER, src[pos:end], line, column))
             else:
-                raise LexerError(f"Unexpected character '{char}'", 
-                               current_line, current_column)
-        except LexerError as e:
-            error_token = Token(TokenType.ERROR, e.message, 
-                              current_line, current_column)
-            self.tokens.append(error_token)
-            raise
-    
-    def _process_string_token(self, line: int, column: int):
-        """处理字符串Token"""
-        value = self.read_string()
-        token = Token(TokenType.STRING, value, line, column)
-        self.tokens.append(token)
-    
-    def _process_number_token(self, line: int, column: int):
-        """处理数字Token"""
-        value = self.read_number()
-        token = Token(TokenType.INTEGER, value, line, column)
-        self.tokens.append(token)
-    
-    def _process_identifier_token(self, line: int, column: int):
-        """处理标识符Token"""
-        value = self.read_identifier()
-        token_type = (TokenType.KEYWORD if value.upper() in self.KEYWORDS
-                     else TokenType.IDENTIFIER)
-        token = Token(token_type, value.upper(), line, column)
-        self.tokens.append(token)
-    
-    def _process_operator_token(self, line: int, column: int):
-        """处理运算符Token"""
-        operator = self._read_operator()
-        token_type = self._get_operator_type(operator)
-        if token_type:
-            token = Token(token_type, operator, line, column)
-            self.tokens.append(token)
-        else:
-            raise LexerError(f"Unknown operator '{operator}'", line, column)
-    
-    def _process_delimiter_token(self, line: int, column: int):
-        """处理分隔符Token"""
-        char = self.advance()
-        token_type = self._get_delimiter_type(char)
-        if token_type:
-            token = Token(token_type, char, line, column)
-            self.tokens.append(token)
-    
-    def _skip_line_comment(self):
-        """跳过单行注释"""
-        while self.current_char() and self.current_char() != '\n':
-            self.advance()
-    
-    def _peek(self, offset: int = 1) -> Optional[str]:
-        """预览字符"""
-        pos = self.position + offset
-        if pos >= len(self.source):
-            return None
-        return self.source[pos]
-    
-    def _read_operator(self) -> str:
-        """读取运算符"""
-        char = self.current_char()
-        
-        if char in ['!', '<', '>'] and self._peek() == '=':
-            self.advance()
-            self.advance()
-            return char + '='
-        elif char == '<' and self._peek() == '>':
-            self.advance()
-            self.advance()
-            return '<>'
+                if kind == 'STRING':
+                    # 正则只匹配开始引号，结尾定位与转义解码在同一遍扫描中完成
+                    value, end = _scan_string(src, pos)
+                    if end == -1:
+                        break
+                    tokens.append(Token(TokenType.STRING, value, line, column))
+
+                # 仅当空白、注释或字符串跨行时才更新行号
+                newlines = src.count('\n', pos, end)
+                if newlines:
+                    line += newlines
+                    line_start = src.rindex('\n', pos, end) + 1
+
+            pos = end
+
+        self.position = pos
+        self.line, self.column = line, pos - line_start + 1
+
+        if pos < length:
+            raise self._scan_error(pos)
+
+        tokens.append(Token(TokenType.EOF, '', self.line, self.column))
+        return tokens
+
+    def _classify_identifier(self, value: str) -> Tuple[TokenType, str]:
+        """识别标识符类型并记入查找表"""
+        upper = sys.intern(value.upper())
+        token_type = (TokenType.KEYWORD if upper in self.KEYWORDS
+                      else TokenType.IDENTIFIER)
+        entry = self._ident_table[value] = (token_type, upper)
+        return entry
+
+    def _scan_error(self, pos: int) -> LexerError:
+        """构造无法识别位置的词法错误"""
+        char = self.source[pos]
+        if char in '"\'':
+            message = "Unterminated string literal"
+        elif char == '!':
+            message = f"Unknown operator '{char}'"
         else:
-            return self.advance()
-    
-    def _get_operator_type(self, operator: str) -> Optional[TokenType]:
-        """获取运算符类型"""
-        mapping = {
-            '=': TokenType.EQUALS,
-            '!=': TokenType.NOT_EQUALS,
-            '<>': TokenType.NOT_EQUALS,
-            '<': TokenType.LESS_THAN,
-            '>': TokenType.GREATER_THAN,
-            '<=': TokenType.LESS_EQUALS,
-            '>=': TokenType.GREATER_EQUALS,
-        }
-        return mapping.get(operator)
-    
-    def _get_delimiter_type(self, delimiter: str) -> Optional[TokenType]:
-        """获取分隔符类型"""
-        mapping = {
-            ',': TokenType.COMMA,
-            ';': TokenType.SEMICOLON,
-            '(': TokenType.LEFT_PAREN,
-            ')': TokenType.RIGHT_PAREN,
-        }
-        return mapping.get(delimiter)
+            message = f"Unexpected character '{char}'"
+        return LexerError(message, self.line, self.column)
     
     def print_tokens(self):
         """打印Token序列"""
         if not self.tokens:
             self.tokenize()
         
-        print("Token序列:")
-        print("=" * 50)
-        print(f"{'类型':<12} {'值':<15} {'位置':<10}")
-        print("-" * 50)
+        lines = [
+            "Token序列:",
+            "=" * 50,
+            f"{'类型':<12} {'值':<15} {'位置':<10}",
+            "-" * 50,
+        ]
         
         for token in self.tokens:
             if token.type == TokenType.EOF:
                 break
             location = f"{token.line}:{token.column}"
-            print(f"{token.type.name:<12} {token.value:<15} {location}")
+            lines.append(f"{token.type.name:<12} {token.value:<15} {location}")
         
-        non_eof_tokens = [t for t in self.tokens if t.type != TokenType.EOF]
-        print("-" * 50)
-        print(f"共生成 {len(non_eof_tokens)} 个Token")
+        # Token序列仅以一个EOF结尾，计数无需再遍历一遍
+        count = len(self.tokens)
+        if self.tokens and self.tokens[-1].type == TokenType.EOF:
+            count -= 1
+        lines.append("-" * 50)
+        lines.append(f"共生成 {count} 个Token")
+        # 整体一次写出，避免逐行print
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
@@ -1,6 +1,6 @@
 """SQL语法分析器 - 负责根据Token序列构建抽象语法树(AST)"""
 
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, cast
 
 from .ast_nodes import (
     BinaryExpression,
@@ -19,6 +19,27 @@ from .ast_nodes import (
 )
 from .lexer import SQLLexer, Token, TokenType
 
+# 需要长度参数的数据类型
+_SIZED_TYPES = frozenset(("VARCHAR", "CHAR"))
+
+# 比较运算符的Token类型
+_COMPARISON_OPERATORS = frozenset(
+    (
+        TokenType.EQUALS,
+        TokenType.NOT_EQUALS,
+        TokenType.LESS_THAN,
+        TokenType.GREATER_THAN,
+        TokenType.LESS_EQUALS,
+        TokenType.GREATER_EQUALS,
+    )
+)
+
+# 字面量Token类型 -> 字面量数据类型名
+_LITERAL_TYPES = {TokenType.INTEGER: "INT", TokenType.STRING: "STRING"}
+
+# 流输入时已消费的Token超过此数量即从self.tokens中丢弃
+_STREAM_WINDOW = 64
+
 
 class ParseError(Exception):
     """语法分析错误"""
@@ -40,58 +61,129 @@ class ParseError(Exception):
 class SQLParser:
     """SQL语法分析器 - 采用递归下降分析方法"""
 
-    def __init__(self, tokens: List[Token]):
-        self.tokens = tokens
+    # 语句首关键字 -> 解析方法名
+    _STATEMENT_PARSERS = {
+        "CREATE": "parse_create_table",
+        "INSERT": "parse_insert",
+        "SELECT": "parse_select",
+        "DELETE": "parse_delete",
+        "UPDATE": "parse_update",
+    }
+
+    def __init__(self, tokens: Iterable[Token]):
+        # 既可传入Token列表，也可传入SQLLexer.iter_tokens()等惰性迭代器；
+        # 后者的Token在前进或预读时才逐个取出并追加到self.tokens，词法错误在
+        # 读到出错位置时才抛出。流输入时self.tokens只是一个窗口：已消费的Token
+        # 会被丢弃（保留当前Token的前一个供peek(-1)使用），self._base记录
+        # self.tokens[0]的位置；position始终是从流开头起算的位置
+        if isinstance(tokens, list):
+            self.tokens: List[Token] = tokens
+            self._stream: Iterator[Token] = iter(())
+        else:
+            self.tokens = []
+            self._stream = iter(tokens)
+        self._trim = self.tokens is not tokens
+        self._base = 0
+        self._eof = Token(TokenType.EOF, "", 0, 0)
         self.position = 0
-        self.current_token = tokens[0] if tokens else None
+        self.current_token = self.tokens[0] if self._fill(0) else None
+
+    def _fill(self, pos: int) -> bool:
+        """从Token流继续读取，直到窗口包含位置pos；流已耗尽时返回False"""
+        tokens = self.tokens
+        consumed = self.position - 1 - self._base
+        if self._trim and consumed >= _STREAM_WINDOW:
+            # 只在需要读取新Token时整段丢弃，摊销后每个Token移动常数次
+            del tokens[:consumed]
+            self._base += consumed
+        index = pos - self._base
+        for token in self._stream:
+            tokens.append(token)
+            if len(tokens) > index:
+                return True
+        return len(tokens) > index
 
     def advance(self):
         """移动到下一个Token"""
-        if self.position < len(self.tokens) - 1:
-            self.position += 1
-            self.current_token = self.tokens[self.position]
+        position = self.position + 1
+        tokens = self.tokens
+        index = position - self._base
+        if index < len(tokens):
+            self.position = position
+            self.current_token = tokens[index]
+        elif self._fill(position):
+            # 读取新Token时窗口可能已被截短，按新的起点重新定位
+            self.position = position
+            self.current_token = tokens[position - self._base]
         else:
-            self.current_token = Token(TokenType.EOF, "", 0, 0)
+            self.current_token = self._eof
 
     def peek(self, offset: int = 1) -> Optional[Token]:
         """预览后续Token"""
         pos = self.position + offset
-        if pos < len(self.tokens):
-            return self.tokens[pos]
+        if pos - self._base < len(self.tokens) or self._fill(pos):
+            return self.tokens[pos - self._base]
         return None
 
     def match(self, *token_types: TokenType) -> bool:
         """检查当前Token是否匹配指定类型"""
-        return self.current_token and self.current_token.type in token_types
+        token = self.current_token
+        return token is not None and token.type in token_types
 
     def consume(self, token_type: TokenType, error_message: str = "") -> Token:
         """消费指定类型的Token"""
-        if not self.match(token_type):
+        token = self.current_token
+        if token is None or token.type != token_type:
             expected = token_type.name
             message = error_message or f"Expected {expected}"
-            raise ParseError(message, self.current_token, expected)
+            raise ParseError(message, token, expected)
 
-        token = self.current_token
         self.advance()
         return token
 
+    def _consume_name(self, error_message: str) -> str:
+        """消费标识符Token并返回其名称"""
+        # Token.value的类型为Union[str, int]，标识符的值总是str
+        return cast(str, self.consume(TokenType.IDENTIFIER, error_message).value)
+
+    def _accept_kw(self, keyword: str) -> bool:
+        """当前Token是指定关键字时消费它并返回True"""
+        # 词法分析器输出的关键字值均已驻留，通常一次身份比较即可判定
+        token = self.current_token
+        value = token.value
+        if token.type is not TokenType.KEYWORD or (
+            value is not keyword and value != keyword
+        ):
+            return False
+        self.advance()
+        return True
+
+    def _expect_kw(self, keyword: str, error_message: str = ""):
+        """消费指定关键字，不匹配时报错"""
+        if not self._accept_kw(keyword):
+            message = error_message or f"Expected {keyword}"
+            raise ParseError(message, self.current_token, keyword)
+
     def parse(self) -> SQLProgram:
         """解析SQL程序"""
         statements = []
+        # 循环内反复使用的属性和枚举成员预先绑定为局部变量
+        eof, error, semicolon = TokenType.EOF, TokenType.ERROR, TokenType.SEMICOLON
+        parse_statement = self.parse_statement
+        advance = self.advance
 
-        while not self.match(TokenType.EOF):
-            if self.current_token.type == TokenType.ERROR:
-                raise ParseError(
-                    f"Lexical error: {self.current_token.value}", self.current_token
-                )
+        while not self.match(eof):
+            token = self.current_token
+            if token.type == error:
+                raise ParseError(f"Lexical error: {token.value}", token)
 
-            stmt = self.parse_statement()
+            stmt = parse_statement()
             if stmt:
                 statements.append(stmt)
 
             # 可选的分号
-            if self.match(TokenType.SEMICOLON):
-                self.advance()
+            if self.current_token.type == semicolon:
+                advance()
 
         return SQLProgram(statements, 1, 1)
 
@@ -101,22 +193,15 @@ class SQLParser:
             return None
 
         if self.match(TokenType.KEYWORD):
-            keyword = self.current_token.value.upper()
-
-            if keyword == "CREATE":
-                return self.parse_create_table()
-            elif keyword == "INSERT":
-                return self.parse_insert()
-            elif keyword == "SELECT":
-                return self.parse_select()
-            elif keyword == "DELETE":
-                return self.parse_delete()
-            elif keyword == "UPDATE":
-                return self.parse_update()
-            else:
+            keyword = cast(str, self.current_token.value)
+
+            # 按语句首关键字一次查表得到方法名，经getattr分派以保留子类重写
+            method_name = self._STATEMENT_PARSERS.get(keyword)
+            if method_name is None:
                 raise ParseError(
                     f"Unsupported statement: {keyword}", self.current_token
                 )
+            return getattr(self, method_name)()
         else:
             raise ParseError(
                 "Expected statement",
@@ -130,28 +215,25 @@ class SQLParser:
 
         self.consume(TokenType.KEYWORD, "Expected CREATE")  # CREATE
 
-        if (
-            not self.match(TokenType.KEYWORD)
-            or self.current_token.value.upper() != "TABLE"
-        ):
-            raise ParseError("Expected TABLE after CREATE", self.current_token, "TABLE")
-        self.advance()  # TABLE
+        self._expect_kw("TABLE", "Expected TABLE after CREATE")
 
         # 表名
-        table_name = self.consume(TokenType.IDENTIFIER, "Expected table name").value
+        table_name = self._consume_name("Expected table name")
 
         # 左括号
         self.consume(TokenType.LEFT_PAREN, "Expected '(' after table name")
 
         # 列定义列表
         columns = []
-        while not self.match(TokenType.RIGHT_PAREN):
-            column = self.parse_column_definition()
-            columns.append(column)
+        parse_column_definition = self.parse_column_definition
+        comma, right_paren = TokenType.COMMA, TokenType.RIGHT_PAREN
+        while self.current_token.type != right_paren:
+            columns.append(parse_column_definition())
 
-            if self.match(TokenType.COMMA):
+            token_type = self.current_token.type
+            if token_type == comma:
                 self.advance()
-            elif not self.match(TokenType.RIGHT_PAREN):
+            elif token_type != right_paren:
                 raise ParseError(
                     "Expected ',' or ')' in column list", self.current_token, ", or )"
                 )
@@ -169,7 +251,7 @@ class SQLParser:
         line, column = self.current_token.line, self.current_token.column
 
         # 列名
-        column_name = self.consume(TokenType.IDENTIFIER, "Expected column name").value
+        column_name = self._consume_name("Expected column name")
 
         # 数据类型
         data_type = self.parse_data_type()
@@ -187,15 +269,15 @@ class SQLParser:
                 "INT, INTEGER, VARCHAR, or CHAR",
             )
 
-        type_name = self.current_token.value.upper()
+        type_name = cast(str, self.current_token.value)
         self.advance()
 
         # 处理带长度的类型，如VARCHAR(50)
         size = None
-        if type_name in ["VARCHAR", "CHAR"] and self.match(TokenType.LEFT_PAREN):
+        if type_name in _SIZED_TYPES and self.match(TokenType.LEFT_PAREN):
             self.advance()  # (
             size_token = self.consume(TokenType.INTEGER, "Expected size after '('")
-            size = int(size_token.value)
+            size = cast(int, size_token.value)
             self.consume(TokenType.RIGHT_PAREN, "Expected ')' after size")
 
         return DataType(type_name, size, line, column)
@@ -206,31 +288,27 @@ class SQLParser:
 
         self.consume(TokenType.KEYWORD, "Expected INSERT")  # INSERT
 
-        if (
-            not self.match(TokenType.KEYWORD)
-            or self.current_token.value.upper() != "INTO"
-        ):
-            raise ParseError("Expected INTO after INSERT", self.current_token, "INTO")
-        self.advance()  # INTO
+        self._expect_kw("INTO", "Expected INTO after INSERT")
 
         # 表名
-        table_name = self.consume(TokenType.IDENTIFIER, "Expected table name").value
+        table_name = self._consume_name("Expected table name")
 
         # 可选的列列表
         columns = None
         if self.match(TokenType.LEFT_PAREN):
             self.advance()  # (
             columns = []
+            consume_name = self._consume_name
+            comma, right_paren = TokenType.COMMA, TokenType.RIGHT_PAREN
 
-            while not self.match(TokenType.RIGHT_PAREN):
-                col_name = self.consume(
-                    TokenType.IDENTIFIER, "Expected column name"
-                ).value
+            while self.current_token.type != right_paren:
+                col_name = consume_name("Expected column name")
                 columns.append(col_name)
 
-                if self.match(TokenType.COMMA):
+                token_type = self.current_token.type
+                if token_type == comma:
                     self.advance()
-                elif not self.match(TokenType.RIGHT_PAREN):
+                elif token_type != right_paren:
                     raise ParseError(
                         "Expected ',' or ')' in column list",
                         self.current_token,
@@ -240,25 +318,22 @@ class SQLParser:
             self.consume(TokenType.RIGHT_PAREN, "Expected ')' after column list")
 
         # VALUES关键字
-        if (
-            not self.match(TokenType.KEYWORD)
-            or self.current_token.value.upper() != "VALUES"
-        ):
-            raise ParseError("Expected VALUES", self.current_token, "VALUES")
-        self.advance()  # VALUES
+        self._expect_kw("VALUES", "Expected VALUES")
 
         # 值列表
         values = []
         self.consume(TokenType.LEFT_PAREN, "Expected '(' after VALUES")
 
         current_row = []
-        while not self.match(TokenType.RIGHT_PAREN):
-            value = self.parse_literal()
-            current_row.append(value)
+        parse_literal = self.parse_literal
+        comma, right_paren = TokenType.COMMA, TokenType.RIGHT_PAREN
+        while self.current_token.type != right_paren:
+            current_row.append(parse_literal())
 
-            if self.match(TokenType.COMMA):
+            token_type = self.current_token.type
+            if token_type == comma:
                 self.advance()
-            elif not self.match(TokenType.RIGHT_PAREN):
+            elif token_type != right_paren:
                 raise ParseError(
                     "Expected ',' or ')' in value list", self.current_token, ", or )"
                 )
@@ -276,44 +351,30 @@ class SQLParser:
 
         # 选择列表
         select_list = []
+        advance = self.advance
+        identifier, comma = TokenType.IDENTIFIER, TokenType.COMMA
         while True:
-            if self.match(TokenType.IDENTIFIER):
-                col_name = self.current_token.value
-                select_list.append(
-                    Identifier(
-                        col_name, self.current_token.line, self.current_token.column
-                    )
-                )
-                self.advance()
-            else:
-                raise ParseError(
-                    "Expected column name in SELECT list", self.current_token
-                )
+            token = self.current_token
+            if token.type != identifier:
+                raise ParseError("Expected column name in SELECT list", token)
+            select_list.append(
+                Identifier(cast(str, token.value), token.line, token.column)
+            )
+            advance()
 
-            if self.match(TokenType.COMMA):
-                self.advance()
+            if self.current_token.type == comma:
+                advance()
             else:
                 break
 
         # FROM子句
-        if (
-            not self.match(TokenType.KEYWORD)
-            or self.current_token.value.upper() != "FROM"
-        ):
-            raise ParseError("Expected FROM", self.current_token, "FROM")
-        self.advance()  # FROM
+        self._expect_kw("FROM", "Expected FROM")
 
-        from_table = self.consume(
-            TokenType.IDENTIFIER, "Expected table name after FROM"
-        ).value
+        from_table = self._consume_name("Expected table name after FROM")
 
         # 可选的WHERE子句
         where_clause = None
-        if (
-            self.match(TokenType.KEYWORD)
-            and self.current_token.value.upper() == "WHERE"
-        ):
-            self.advance()  # WHERE
+        if self._accept_kw("WHERE"):
             where_clause = self.parse_expression()
 
         return SelectStatement(select_list, from_table, where_clause, line, column)
@@ -324,22 +385,13 @@ class SQLParser:
 
         self.consume(TokenType.KEYWORD, "Expected DELETE")  # DELETE
 
-        if (
-            not self.match(TokenType.KEYWORD)
-            or self.current_token.value.upper() != "FROM"
-        ):
-            raise ParseError("Expected FROM after DELETE", self.current_token, "FROM")
-        self.advance()  # FROM
+        self._expect_kw("FROM", "Expected FROM after DELETE")
 
-        table_name = self.consume(TokenType.IDENTIFIER, "Expected table name").value
+        table_name = self._consume_name("Expected table name")
 
         # 可选的WHERE子句
         where_clause = None
-        if (
-            self.match(TokenType.KEYWORD)
-            and self.current_token.value.upper() == "WHERE"
-        ):
-            self.advance()  # WHERE
+        if self._accept_kw("WHERE"):
             where_clause = self.parse_expression()
 
         return DeleteStatement(table_name, where_clause, line, column)
@@ -350,22 +402,15 @@ class SQLParser:
 
         self.consume(TokenType.KEYWORD, "Expected UPDATE")  # UPDATE
 
-        table_name = self.consume(TokenType.IDENTIFIER, "Expected table name").value
+        table_name = self._consume_name("Expected table name")
 
         # SET子句
-        if (
-            not self.match(TokenType.KEYWORD)
-            or self.current_token.value.upper() != "SET"
-        ):
-            raise ParseError("Expected SET after table name", self.current_token, "SET")
-        self.advance()  # SET
+        self._expect_kw("SET", "Expected SET after table name")
 
         # 解析赋值列表 column=value, column=value, ...
         assignments = []
         while True:
-            column_name = self.consume(
-                TokenType.IDENTIFIER, "Expected column name"
-            ).value
+            column_name = self._consume_name("Expected column name")
             self.consume(TokenType.EQUALS, "Expected '=' after column name")
             value = self.parse_primary()
             assignments.append((column_name, value))
@@ -377,71 +422,70 @@ class SQLParser:
 
         # 可选的WHERE子句
         where_clause = None
-        if (
-            self.match(TokenType.KEYWORD)
-            and self.current_token.value.upper() == "WHERE"
-        ):
-            self.advance()  # WHERE
+        if self._accept_kw("WHERE"):
             where_clause = self.parse_expression()
 
         return UpdateStatement(table_name, assignments, where_clause, line, column)
 
     def parse_expression(self) -> Expression:
         """解析表达式 - 简单的比较表达式"""
-        return self.parse_comparison()
+        # 操作数只能是标识符或字面量，在此直接构造，
+        # 不再经过parse_primary/parse_literal的逐层调用
+        operands: List[Expression] = []
+        operator = None
+        while True:
+            token = self.current_token
+            if token.type is TokenType.IDENTIFIER:
+                operand: Expression = Identifier(
+                    cast(str, token.value), token.line, token.column
+                )
+            else:
+                data_type = _LITERAL_TYPES.get(token.type)
+                if data_type is None:
+                    raise ParseError("Expected identifier or literal", token)
+                operand = Literal(token.value, data_type, token.line, token.column)
+            operands.append(operand)
+            self.advance()
 
-    def parse_comparison(self) -> Expression:
-        """解析比较表达式"""
-        left = self.parse_primary()
-
-        if self.match(
-            TokenType.EQUALS,
-            TokenType.NOT_EQUALS,
-            TokenType.LESS_THAN,
-            TokenType.GREATER_THAN,
-            TokenType.LESS_EQUALS,
-            TokenType.GREATER_EQUALS,
-        ):
+            if operator is not None:
+                return BinaryExpression(
+                    operands[0],
+                    cast(str, operator.value),
+                    operand,
+                    operator.line,
+                    operator.column,
+                )
 
-            operator = self.current_token.value
-            line, column = self.current_token.line, self.current_token.column
+            operator = self.current_token
+            if operator.type not in _COMPARISON_OPERATORS:
+                return operand
             self.advance()
 
-            right = self.parse_primary()
-            return BinaryExpression(left, operator, right, line, column)
-
-        return left
+    def parse_comparison(self) -> Expression:
+        """解析比较表达式"""
+        # 比较表达式即当前支持的全部表达式
+        return self.parse_expression()
 
     def parse_primary(self) -> Expression:
         """解析基本表达式"""
-        if self.match(TokenType.IDENTIFIER):
-            name = self.current_token.value
-            line, column = self.current_token.line, self.current_token.column
+        token = self.current_token
+        if token.type is TokenType.IDENTIFIER:
             self.advance()
-            return Identifier(name, line, column)
+            return Identifier(cast(str, token.value), token.line, token.column)
 
-        elif self.match(TokenType.INTEGER, TokenType.STRING):
+        if token.type in _LITERAL_TYPES:
             return self.parse_literal()
 
-        else:
-            raise ParseError("Expected identifier or literal", self.current_token)
+        raise ParseError("Expected identifier or literal", token)
 
     def parse_literal(self) -> Literal:
         """解析字面量"""
-        if self.match(TokenType.INTEGER):
-            value = int(self.current_token.value)
-            line, column = self.current_token.line, self.current_token.column
-            self.advance()
-            return Literal(value, "INT", line, column)
-
-        elif self.match(TokenType.STRING):
-            value = self.current_token.value
-            line, column = self.current_token.line, self.current_token.column
-            self.advance()
-            return Literal(value, "STRING", line, column)
-
-        else:
-            raise ParseError("Expected literal value", self.current_token)
+        token = self.current_token
+        data_type = _LITERAL_TYPES.get(token.type)
+        if data_type is None:
+            raise ParseError("Expected literal value", token)
+        self.advance()
+        return Literal(token.value, data_type, token.line, token.column)
 
 
 def main():
@@ -93,7 +93,7 @@ class PlanGenerator(ASTVisitor):
 
         for statement in ast.statements:
             try:
-                plan = statement.accept(self)
+                plan = self.walk(statement)
                 if plan:
                     plans.append(plan)
             except Exception as e:
@@ -19,7 +19,7 @@ from .ast_nodes import (
     SQLProgram,
     UpdateStatement,
 )
-from .catalog import Catalog, ColumnInfo
+from .catalog import Catalog, ColumnInfo, TableInfo
 
 
 class SemanticError(Exception):
@@ -42,13 +42,15 @@ class SemanticAnalyzer(ASTVisitor):
         self.catalog = catalog or Catalog()
         self.errors: List[SemanticError] = []
         self.current_table: Optional[str] = None
+        # 当前语句解析到的表信息，语句内只查找一次目录
+        self.current_table_info: Optional[TableInfo] = None
 
     def analyze(self, ast: SQLProgram) -> Tuple[bool, List[SemanticError]]:
         """执行语义分析"""
         self.errors.clear()
 
         try:
-            ast.accept(self)
+            self.walk(ast)
             return len(self.errors) == 0, self.errors
         except Exception as e:
             # 未预期的错误也转换为语义错误
@@ -56,6 +58,16 @@ class SemanticAnalyzer(ASTVisitor):
             self.errors.append(error)
             return False, self.errors
 
+    def _enter_table(self, table_name: str, table_info: TableInfo):
+        """记录当前语句作用的表，语句内后续检查直接复用其TableInfo"""
+        self.current_table = table_name
+        self.current_table_info = table_info
+
+    def _leave_table(self):
+        """清除当前语句作用的表"""
+        self.current_table = None
+        self.current_table_info = None
+
     def add_error(self, error_type: str, message: str, line: int, column: int):
         """添加语义错误"""
         error = SemanticError(error_type, message, line, column)
@@ -64,7 +76,7 @@ class SemanticAnalyzer(ASTVisitor):
     def visit_sql_program(self, node: SQLProgram):
         """访问SQL程序节点"""
         for statement in node.statements:
-            statement.accept(self)
+            self.walk(statement)
 
     def visit_create_table_statement(self, node: CreateTableStatement):
         """访问CREATE TABLE语句节点"""
@@ -99,11 +111,13 @@ class SemanticAnalyzer(ASTVisitor):
             return
 
         # 验证数据类型
+        error_count = len(self.errors)
         for col_def in node.columns:
-            col_def.accept(self)
+            self.walk(col_def)
 
-        # 如果没有错误，将表添加到catalog
-        if not any(error.line == node.line for error in self.errors):
+        # 如果本语句没有产生错误，将表添加到catalog
+        # （按错误数量判断而非行号，同一行的其他语句或无位置信息的AST不受影响）
+        if len(self.errors) == error_count:
             columns = []
             for col_def in node.columns:
                 col_info = ColumnInfo(
@@ -118,7 +132,8 @@ class SemanticAnalyzer(ASTVisitor):
     def visit_insert_statement(self, node: InsertStatement):
         """访问INSERT语句节点"""
         # 检查表是否存在
-        if not self.catalog.table_exists(node.table_name):
+        table_info = self.catalog.get_table_info(node.table_name)
+        if table_info is None:
             self.add_error(
                 "TABLE_NOT_EXISTS",
                 f"Table '{node.table_name}' does not exist",
@@ -127,8 +142,7 @@ class SemanticAnalyzer(ASTVisitor):
             )
             return
 
-        table_info = self.catalog.get_table_info(node.table_name)
-        self.current_table = node.table_name
+        self._enter_table(node.table_name, table_info)
 
         # 获取目标列信息
         target_columns = []
@@ -171,12 +185,13 @@ class SemanticAnalyzer(ASTVisitor):
                         value.column,
                     )
 
-        self.current_table = None
+        self._leave_table()
 
     def visit_select_statement(self, node: SelectStatement):
         """访问SELECT语句节点"""
         # 检查FROM表是否存在
-        if not self.catalog.table_exists(node.from_table):
+        table_info = self.catalog.get_table_info(node.from_table)
+        if table_info is None:
             self.add_error(
                 "TABLE_NOT_EXISTS",
                 f"Table '{node.from_table}' does not exist",
@@ -185,8 +200,7 @@ class SemanticAnalyzer(ASTVisitor):
             )
             return
 
-        self.current_table = node.from_table
-        table_info = self.catalog.get_table_info(node.from_table)
+        self._enter_table(node.from_table, table_info)
 
         # 检查选择的列是否存在
         for select_item in node.select_list:
@@ -204,14 +218,15 @@ class SemanticAnalyzer(ASTVisitor):
 
         # 检查WHERE条件
         if node.where_clause:
-            node.where_clause.accept(self)
+            self.walk(node.where_clause)
 
-        self.current_table = None
+        self._leave_table()
 
     def visit_delete_statement(self, node: DeleteStatement):
         """访问DELETE语句节点"""
         # 检查表是否存在
-        if not self.catalog.table_exists(node.table_name):
+        table_info = self.catalog.get_table_info(node.table_name)
+        if table_info is None:
             self.add_error(
                 "TABLE_NOT_EXISTS",
                 f"Table '{node.table_name}' does not exist",
@@ -220,18 +235,19 @@ class SemanticAnalyzer(ASTVisitor):
             )
             return
 
-        self.current_table = node.table_name
+        self._enter_table(node.table_name, table_info)
 
         # 检查WHERE条件
         if node.where_clause:
-            node.where_clause.accept(self)
+            self.walk(node.where_clause)
 
-        self.current_table = None
+        self._leave_table()
 
     def visit_update_statement(self, node: UpdateStatement):
         """访问UPDATE语句节点"""
         # 检查表是否存在
-        if not self.catalog.table_exists(node.table_name):
+        table_info = self.catalog.get_table_info(node.table_name)
+        if table_info is None:
             self.add_error(
                 "TABLE_NOT_EXISTS",
                 f"Table '{node.table_name}' does not exist",
@@ -240,12 +256,12 @@ class SemanticAnalyzer(ASTVisitor):
             )
             return
 
-        self.current_table = node.table_name
-        table_info = self.catalog.get_table_info(node.table_name)
+        self._enter_table(node.table_name, table_info)
 
         # 检查列是否存在及类型匹配
         for column_name, value_expr in node.assignments:
-            if not self.catalog.column_exists(node.table_name, column_name):
+            column_info = table_info.get_column(column_name)
+            if column_info is None:
                 self.add_error(
                     "COLUMN_NOT_EXISTS",
                     f"Column '{column_name}' does not exist in table '{node.table_name}'",
@@ -255,12 +271,9 @@ class SemanticAnalyzer(ASTVisitor):
                 continue
 
             # 检查值表达式
-            value_expr.accept(self)
+            self.walk(value_expr)
 
             # 类型兼容性检查
-            column_info = next(
-                (col for col in table_info.columns if col.name == column_name), None
-            )
             if column_info:
                 value_type = self.get_expression_type(value_expr)
                 if value_type and not self.are_types_compatible(
@@ -275,15 +288,15 @@ class SemanticAnalyzer(ASTVisitor):
 
         # 检查WHERE条件
         if node.where_clause:
-            node.where_clause.accept(self)
+            self.walk(node.where_clause)
 
-        self.current_table = None
+        self._leave_table()
 
     def visit_binary_expression(self, node: BinaryExpression):
         """访问二元表达式节点"""
         # 递归检查左右操作数
-        node.left.accept(self)
-        node.right.accept(self)
+        self.walk(node.left)
+        self.walk(node.right)
 
         # 类型兼容性检查
         left_type = self.get_expression_type(node.left)
@@ -300,15 +313,14 @@ class SemanticAnalyzer(ASTVisitor):
 
     def visit_identifier(self, node: Identifier):
         """访问标识符节点"""
-        if self.current_table:
-            table_info = self.catalog.get_table_info(self.current_table)
-            if table_info and not table_info.get_column(node.name):
-                self.add_error(
-                    "COLUMN_NOT_EXISTS",
-                    f"Column '{node.name}' does not exist in table '{self.current_table}'",
-                    node.line,
-                    node.column,
-                )
+        table_info = self.current_table_info
+        if table_info and not table_info.get_column(node.name):
+            self.add_error(
+                "COLUMN_NOT_EXISTS",
+                f"Column '{node.name}' does not exist in table '{self.current_table}'",
+                node.line,
+                node.column,
+            )
 
     def visit_literal(self, node: Literal):
         """访问字面量节点"""
@@ -318,7 +330,7 @@ class SemanticAnalyzer(ASTVisitor):
     def visit_column_def(self, node: ColumnDef):
         """访问列定义节点"""
         # 验证数据类型
-        node.data_type.accept(self)
+        self.walk(node.data_type)
 
     def visit_data_type(self, node: DataType):
         """访问数据类型节点"""
@@ -377,8 +389,8 @@ class SemanticAnalyzer(ASTVisitor):
         """获取表达式的类型"""
         if isinstance(expr, Literal):
             return self.get_literal_type(expr)
-        elif isinstance(expr, Identifier) and self.current_table:
-            col_info = self.catalog.get_column_info(self.current_table, expr.name)
+        elif isinstance(expr, Identifier) and self.current_table_info:
+            col_info = self.current_table_info.get_column(expr.name)
             return col_info.data_type if col_info else None
 
         return None
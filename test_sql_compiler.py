@@ -11,6 +11,9 @@ project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
 from sql_compiler import SQLLexer, SQLParser, SemanticAnalyzer, PlanGenerator
+from sql_compiler import lexer as lexer_module
+from sql_compiler.lexer import LexerError
+from sql_compiler import lexer_clean
 
 
 def test_lexer():
@@ -188,6 +191,227 @@ def test_error_cases():
             print(f"✓ 正确检测到错误: {e}")
 
 
+def test_scanner_backends():
+    """测试词法分析器的扫描后端选项"""
+    print("\n" + "=" * 60)
+    print("测试扫描后端")
+    print("=" * 60)
+    
+    # 后端是实例级选项，不影响其他词法分析器
+    assert SQLLexer("SELECT a FROM t").backend == "re"
+    try:
+        SQLLexer("SELECT a FROM t", backend="unknown")
+        assert False, "未知后端应当报错"
+    except ValueError:
+        pass
+    assert SQLLexer("SELECT a FROM t").backend == "re"
+    print("✓ 后端选项只作用于单个实例")
+    
+    if lexer_module.re2 is None:
+        print("未安装google-re2，跳过re/re2一致性测试")
+        return
+    
+    samples = [
+        "SELECT id, name FROM student WHERE age >= 18;",
+        "INSERT INTO t VALUES (1, 'a\\'b', \"c\\nd\");",
+        "-- 注释\nSELECT ñame FROM t /* 多行\n注释 */;",
+        "SELECT a\u00a0FROM t\u2028WHERE b <> 3",
+        "SELECT a² FROM t", "½", "²", "١٢٣", "a ! b", "'unterminated",
+    ]
+    for sql in samples:
+        results = []
+        for backend in ("re", "re2"):
+            try:
+                results.append(SQLLexer(sql, backend=backend).tokenize())
+            except LexerError as e:
+                results.append(str(e))
+        assert results[0] == results[1], f"re与re2结果不一致: {sql!r}"
+    print(f"✓ re与re2在 {len(samples)} 条输入上结果一致")
+
+
+def test_positionless_tokens():
+    """测试不记录位置的词法分析模式"""
+    print("\n" + "=" * 60)
+    print("测试无位置Token模式")
+    print("=" * 60)
+    
+    sql = "SELECT id FROM student WHERE id = 1; SELECT id FROM student;"
+    tokens = SQLLexer(sql, positions=False).tokenize()
+    assert all(token.line == 0 and token.column == 0 for token in tokens)
+    assert tokens[-1].type.name == "EOF"
+    # 相同类型和值的Token共用同一个对象
+    assert tokens[0] is tokens[9] and tokens[1] is tokens[10]
+    print(f"✓ {len(tokens)} 个Token（含EOF）均不带位置，重复Token共享对象")
+    
+    # 无位置的AST中，一条CREATE TABLE出错不应影响后续表的注册
+    sql = ("CREATE TABLE bad(name VARCHAR); "
+           "CREATE TABLE good(id INT); SELECT id FROM good;")
+    for positions in (True, False):
+        ast = SQLParser(SQLLexer(sql, positions=positions).tokenize()).parse()
+        analyzer = SemanticAnalyzer()
+        success, errors = analyzer.analyze(ast)
+        assert not success and len(errors) == 1, errors
+        assert not analyzer.catalog.table_exists("bad")
+        assert analyzer.catalog.table_exists("good")
+    print("✓ 出错的CREATE TABLE不影响同一行及无位置AST中其他表的注册")
+
+
+def test_parser_overrides():
+    """测试子类重写的解析方法会被调用"""
+    print("\n" + "=" * 60)
+    print("测试解析方法重写")
+    print("=" * 60)
+    
+    class CustomParser(SQLParser):
+        def parse_select(self):
+            return "overridden"
+    
+    tokens = SQLLexer("SELECT id FROM student;").tokenize()
+    assert CustomParser(tokens).parse_statement() == "overridden"
+    print("✓ parse_statement 分派到子类的 parse_select")
+    
+    class ExpressionParser(SQLParser):
+        def parse_expression(self):
+            self.advance()
+            return "expression"
+    
+    tokens = SQLLexer("id").tokenize()
+    assert ExpressionParser(tokens).parse_comparison() == "expression"
+    tokens = SQLLexer("DELETE FROM t WHERE id = 1;").tokenize()
+    assert ExpressionParser(tokens).parse_delete().where_clause == "expression"
+    print("✓ parse_comparison 与WHERE子句经由子类的 parse_expression")
+    
+    literals = []
+    
+    class LiteralParser(SQLParser):
+        def parse_literal(self):
+            literal = super().parse_literal()
+            literals.append(literal.value)
+            return literal
+    
+    sql = "INSERT INTO t VALUES (1, 'a'); UPDATE t SET a = 2;"
+    LiteralParser(SQLLexer(sql).tokenize()).parse()
+    assert literals == [1, "a", 2], literals
+    print("✓ INSERT值列表与SET赋值中的字面量经由 parse_literal 解析")
+
+
+def test_streaming_parser():
+    """测试由Token流直接进行语法分析"""
+    print("\n" + "=" * 60)
+    print("测试Token流语法分析")
+    print("=" * 60)
+    
+    sql = """
+    CREATE TABLE student(id INT, name VARCHAR(50));
+    INSERT INTO student(id, name) VALUES (1, 'Alice');
+    SELECT id, name FROM student WHERE id >= 1;
+    UPDATE student SET name = 'Bob' WHERE id = 1;
+    DELETE FROM student WHERE id <> 2;
+    """
+    list_ast = SQLParser(SQLLexer(sql).tokenize()).parse()
+    stream_ast = SQLParser(SQLLexer(sql).iter_tokens()).parse()
+    assert repr(stream_ast) == repr(list_ast)
+    assert [(stmt.line, stmt.column) for stmt in stream_ast.statements] == [
+        (stmt.line, stmt.column) for stmt in list_ast.statements
+    ]
+    print(f"✓ Token流与Token列表得到相同的AST（{len(stream_ast.statements)} 条语句）")
+    
+    # tokens、position、peek 与传入列表时的行为一致
+    parser = SQLParser(SQLLexer("SELECT a FROM t").iter_tokens())
+    parser.advance()
+    assert parser.position == 1
+    assert parser.peek(-1).value == "SELECT"
+    assert [token.value for token in parser.tokens] == ["SELECT", "A"]
+    for _ in range(5):
+        parser.advance()
+    assert parser.position == 4 and parser.current_token.type.name == "EOF"
+    print("✓ tokens、position、peek 行为与列表输入一致")
+    
+    # 流输入只保留最近读取的Token窗口，已消费的Token不会留在parser.tokens中
+    sql = "SELECT id, name FROM student WHERE id >= 1;\n" * 2000
+    tokens = SQLLexer(sql).tokenize()
+    parser = SQLParser(SQLLexer(sql).iter_tokens())
+    assert len(parser.parse().statements) == 2000
+    window = len(parser.tokens)
+    assert window < 100, window
+    assert parser.position == len(tokens) - 1
+    assert parser.current_token.type.name == "EOF"
+    assert parser.peek(-1).value == ";"
+    # 列表输入保持原样
+    parser = SQLParser(tokens)
+    parser.parse()
+    assert parser.tokens is tokens and len(tokens) == 22001
+    print(f"✓ 流输入解析 {len(tokens)} 个Token后仅保留 {window} 个")
+    
+    # 流中途出现的词法错误直接传播给调用方
+    parser = SQLParser(SQLLexer("SELECT a FROM t; SELECT @ FROM t;").iter_tokens())
+    try:
+        parser.parse()
+        assert False, "应当抛出LexerError"
+    except LexerError as e:
+        assert (e.line, e.column) == (1, 25)
+        print(f"✓ 解析途中的词法错误被传播: {e}")
+
+
+def test_clean_lexer():
+    """测试简化版词法分析器的边界情况"""
+    print("\n" + "=" * 60)
+    print("测试简化版词法分析器")
+    print("=" * 60)
+    
+    def lex(sql):
+        return [(t.type.name, t.value, t.line, t.column)
+                for t in lexer_clean.SQLLexer(sql).tokenize()]
+    
+    # 字符串转义：转义的反斜杠、转义的引号
+    assert lex(r"'a\\'")[0] == ("STRING", "a\\", 1, 1)
+    assert lex(r"'it\'s'")[0] == ("STRING", "it's", 1, 1)
+    assert lex(r'"a\"b"')[0] == ("STRING", 'a"b', 1, 1)
+    print("✓ 字符串转义解码正确")
+    
+    # 未闭合字符串（含紧贴结尾的反斜杠）报告开始引号的位置
+    for sql, column in (("'ab\\", 1), ("x 'abc", 3), ("x 'a\nb", 3)):
+        try:
+            lex(sql)
+        except lexer_clean.LexerError as e:
+            assert e.message == "Unterminated string literal", e
+            assert (e.line, e.column) == (1, column), e
+        else:
+            raise AssertionError(f"{sql!r} 应报未闭合字符串")
+    print("✓ 未闭合字符串的错误位置正确")
+    
+    # 跨行字符串和注释之后的行列号
+    tokens = lex("SELECT 'a\nbc', x -- note\n  FROM t")
+    assert tokens[1] == ("STRING", "a\nbc", 1, 8)
+    assert tokens[2] == ("COMMA", ",", 2, 4)
+    assert tokens[3] == ("IDENTIFIER", "X", 2, 6)
+    assert tokens[4] == ("KEYWORD", "FROM", 3, 3)
+    print("✓ 跨行字符串和注释之后的行列号正确")
+    
+    # 大小写混合的关键字首次识别后记入查找表，再次出现时直接命中
+    lexer = lexer_clean.SQLLexer("SeLeCt x FrOm t; SeLeCt y FrOm t;")
+    tokens = lexer.tokenize()
+    assert tokens[0].type.name == "KEYWORD" and tokens[0].value == "SELECT"
+    assert tokens[5] == tokens[0]._replace(column=18)
+    assert lexer._ident_table["SeLeCt"] == (lexer_clean.TokenType.KEYWORD,
+                                             "SELECT")
+    assert "SeLeCt" not in lexer_clean._IDENT_TABLE
+    print("✓ 大小写混合的关键字经查找表识别，且不写入共享表")
+    
+    # '²'等isdigit()字符与原先一样按整数读取，'½'仍报错
+    assert lex("0²")[0] == ("INTEGER", "0²", 1, 1)
+    assert lex("12²ab")[:2] == [("INTEGER", "12²", 1, 1),
+                                ("IDENTIFIER", "AB", 1, 4)]
+    assert lex("a²")[0] == ("IDENTIFIER", "A²", 1, 1)
+    try:
+        lex("1½")
+    except lexer_clean.LexerError as e:
+        assert (e.line, e.column) == (1, 2), e
+    else:
+        raise AssertionError("'½' 应报错")
+    print("✓ 非十进制数字字符的处理与原实现一致")
+
+
 def main():
     """主测试函数"""
     print("SQL编译器综合测试")
@@ -203,6 +427,11 @@ def main():
     
     # 测试错误处理
     test_error_cases()
+    test_scanner_backends()
+    test_positionless_tokens()
+    test_parser_overrides()
+    test_streaming_parser()
+    test_clean_lexer()
     
     print("\n" + "=" * 60)
     print("测试完成")